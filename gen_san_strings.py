@@ -1,9 +1,69 @@
 import chess
-from typing import Literal, Set
-
-
-_b = chess.Board.empty()
-""" A blank `chess.Board` to use for generating moves. """
+from typing import Dict, Literal, Set, Tuple
+
+
+_FILE_OF: Tuple[int, ...] = tuple(sq & 7 for sq in chess.SQUARES)
+""" The file index of each square, equivalent to `chess.square_file`. """
+
+_RANK_OF: Tuple[int, ...] = tuple(sq >> 3 for sq in chess.SQUARES)
+""" The rank index of each square, equivalent to `chess.square_rank`. """
+
+_NAME_OF: Tuple[str, ...] = tuple(chess.SQUARE_NAMES)
+""" The name of each square, equivalent to `chess.square_name`. """
+
+_FILE_NAME_OF: Tuple[str, ...] = tuple(chess.FILE_NAMES[f] for f in _FILE_OF)
+""" The name of the file containing each square, e.g. `"e"` for `chess.E4`. """
+
+_RANK_NAME_OF: Tuple[str, ...] = tuple(chess.RANK_NAMES[r] for r in _RANK_OF)
+""" The name of the rank containing each square, e.g. `"4"` for `chess.E4`. """
+
+_FILE_BB_OF: Tuple[chess.Bitboard, ...] = tuple(
+    chess.BB_FILES[_FILE_OF[sq]] for sq in chess.SQUARES
+)
+""" The bitmask of the file containing each square. """
+
+_RANK_BB_OF: Tuple[chess.Bitboard, ...] = tuple(
+    chess.BB_RANKS[_RANK_OF[sq]] for sq in chess.SQUARES
+)
+""" The bitmask of the rank containing each square. """
+
+_PAWN_OCCUPIABLE: Tuple[chess.Square, ...] = tuple(
+    chess.scan_forward(chess.BB_ALL - chess.BB_BACKRANKS)
+)
+""" The squares a pawn of either color can stand on, i.e. ranks 2 through 7. """
+
+_ATTACKS: Dict[str, Tuple[chess.Bitboard, ...]] = {
+    "N": tuple(chess.BB_KNIGHT_ATTACKS),
+    "B": tuple(chess.BB_DIAG_ATTACKS[sq][0] for sq in chess.SQUARES),
+    "R": tuple(
+        chess.BB_RANK_ATTACKS[sq][0] | chess.BB_FILE_ATTACKS[sq][0]
+        for sq in chess.SQUARES
+    ),
+    "Q": tuple(
+        chess.BB_DIAG_ATTACKS[sq][0]
+        | chess.BB_RANK_ATTACKS[sq][0]
+        | chess.BB_FILE_ATTACKS[sq][0]
+        for sq in chess.SQUARES
+    ),
+}
+"""
+The squares attacked by each piece type from each square of an otherwise
+empty board, indexed by piece symbol and then by square.
+"""
+
+_PIECE_MOVES: Dict[str, Tuple[Tuple[chess.Square, chess.Square], ...]] = {
+    symbol: tuple(
+        (to_square, from_square)
+        for to_square in chess.SQUARES
+        for from_square in chess.scan_forward(attacks_by_square[to_square])
+    )
+    for symbol, attacks_by_square in _ATTACKS.items()
+}
+"""
+Every `(to_square, from_square)` pair such that each piece type can move
+from `from_square` to `to_square` on an otherwise empty board, indexed by
+piece symbol.
+"""
 
 
 def _sign(x: int) -> Literal[-1, 0, 1]:
@@ -26,12 +86,12 @@ def _sliding_delta(s1: chess.Square, s2: chess.Square) -> int:
     """
     assert s1 != s2, "s1 and s2 must be different squares"
 
-    x_delta = chess.square_file(s2) - chess.square_file(s1)
-    y_delta = chess.square_rank(s2) - chess.square_rank(s1)
+    x_delta = _FILE_OF[s2] - _FILE_OF[s1]
+    y_delta = _RANK_OF[s2] - _RANK_OF[s1]
 
     assert 0 in (x_delta, y_delta) or abs(x_delta) == abs(y_delta), (
         "s1 and s2 must be on the same file, rank, or diagonal; got "
-        f"{chess.square_name(s1)} and {chess.square_name(s2)}"
+        f"{_NAME_OF[s1]} and {_NAME_OF[s2]}"
     )
 
     x_delta = _sign(x_delta)
@@ -61,44 +121,66 @@ def _extend_ray_from_towards(
     return chess._sliding_attacks(from_sq, 0, [d]) | chess.BB_SQUARES[from_sq]
 
 
+_EXTENDED_RAYS: Tuple[Tuple[chess.Bitboard, ...], ...] = tuple(
+    tuple(
+        (
+            _extend_ray_from_towards(from_sq, towards_sq)
+            if _ATTACKS["Q"][from_sq] & chess.BB_SQUARES[towards_sq]
+            else chess.BB_SQUARES[towards_sq]
+        )
+        for towards_sq in chess.SQUARES
+    )
+    for from_sq in chess.SQUARES
+)
+"""
+`_extend_ray_from_towards(from_sq, towards_sq)` precomputed as
+`_EXTENDED_RAYS[from_sq][towards_sq]` for every pair of squares sharing
+a file, rank, or diagonal. For all other pairs (such as knight moves),
+nothing can be blocked by a piece on `towards_sq`, so the entry is just
+`towards_sq` itself.
+"""
+
+
 def get_pawn_sans(only_for_color: chess.Color | None = None) -> Set[str]:
     """
     Get all possible SAN strings for pawn moves. If `only_for_color` is
     specified, then only return pawn moves for that color; otherwise return
     pawn moves for both colors.
     """
-    sans = set()
-
-    PAWN_OCCUPIABLE = chess.SquareSet(chess.BB_ALL - chess.BB_BACKRANKS)
-
-    w_pawn = chess.Piece.from_symbol("P")
-    b_pawn = chess.Piece.from_symbol("p")
+    sans = []
+
+    # The single push plus a capture onto each diagonally attacked square, as
+    # `(prefix, to_square)` pairs for white. Double pushes need no special
+    # handling since they land on squares that are also reachable by a single
+    # push. Black's moves are these mirrored vertically (`to_square ^ 56`),
+    # which leaves files, and therefore the capture prefixes, unchanged.
+    white_moves = []
+    for from_square in _PAWN_OCCUPIABLE:
+        capture_prefix = _FILE_NAME_OF[from_square] + "x"
+
+        white_moves.append(("", from_square + 8))
+        for to_square in chess.scan_forward(
+            chess.BB_PAWN_ATTACKS[chess.WHITE][from_square]
+        ):
+            white_moves.append((capture_prefix, to_square))
 
     def add_pawn_sans_for_color(color: chess.Color):
-        _b.turn = color
-        self_pawn = w_pawn if color == chess.WHITE else b_pawn
-        other_pawn = b_pawn if color == chess.WHITE else w_pawn
-
-        for from_square in PAWN_OCCUPIABLE:
-            _b.clear_board()
-            _b.set_piece_at(from_square, self_pawn)
-            attacks = _b.attacks(from_square)
+        mirror = 0 if color == chess.WHITE else 56
 
-            # Set enemy pawns at the diagonal attacked squares
-            for s in attacks:
-                _b.set_piece_at(s, other_pawn)
-
-            # Now forward moves and the diagonal captures are legal,
-            # so we can just add all legal SAN moves
-            for move in _b.legal_moves:
-                sans.add(_b.san(move))
+        for prefix, to_square in white_moves:
+            to_square_name = _NAME_OF[to_square ^ mirror]
+            if chess.BB_SQUARES[to_square] & chess.BB_BACKRANKS:
+                for promotion in ("Q", "R", "B", "N"):
+                    sans.append(f"{prefix}{to_square_name}={promotion}")
+            else:
+                sans.append(f"{prefix}{to_square_name}")
 
     if only_for_color in (chess.WHITE, None):
         add_pawn_sans_for_color(chess.WHITE)
     if only_for_color in (chess.BLACK, None):
         add_pawn_sans_for_color(chess.BLACK)
 
-    return sans
+    return set(sans)
 
 
 def get_piece_sans(symbol: Literal["N", "B", "R", "Q"]) -> Set[str]:
@@ -113,170 +195,151 @@ def get_piece_sans(symbol: Literal["N", "B", "R", "Q"]) -> Set[str]:
         "Q",
     ), f'Invalid piece symbol {symbol}, must be in ("N", "B", "R", "Q")'
 
-    sans = set()
+    sans = []
 
-    def add_sans(discriminator: str, to_square: chess.Square):
-        """
-        Add two SAN strings to `sans` for the given `discriminator` and `to_square`:
-        one for a non-capturing move and one for a capturing move.
-        """
-        to_square_name = chess.square_name(to_square)
-        for capture in ("", "x"):
-            sans.add(f"{symbol}{discriminator}{capture}{to_square_name}")
+    attacks_by_square = _ATTACKS[symbol]
 
-    for to_square in chess.SQUARES:
+    for to_square_name in _NAME_OF:
         # We always add the un-discriminated move and capturing move
-        add_sans("", to_square)
-
-        """
-        To really understand the code below, we need to understand the algorithm a human uses
-        to determine whether a move from a `from_square` to a `to_square` might require a
-        file, rank, and/or full-square discriminator.
-
-        First we should consider that if moving from `from_square` to `to_square` is a legal
-        move, then even if there is another piece of the same type and color on the ray which extends 
-        from `to_square` to `from_square` and continues on to an edge of the board, moving that piece 
-        to `to_square` would be illegal. If this piece falls between `from_square` and `to_square`,
-        then the original move would not be legal, so we have a contradiction. If it is past 
-        `from_square` (on the extension of the ray between the squares that continues to the edge of 
-        the board), then it is not legal because it cannot jump over the piece at `from_square` to 
-        reach `to_square`.
-
-        This is important when considering disriminators because we are only interested in squares
-        from which another `piece` can legally move to `to_square`, and those which might create 
-        a situation where a rank, file, or full-square discriminator is necessary.
-
-        With this in mind, the algorithm for determining whether we need a **file** discriminator
-        is as follows:
-          - Take an empty board and place a `piece` on `to_square`, then get a bitboard `attacks`
-            of all the squares it can move to. These may all be considered possible `from_square`s.
-          - Consider each `from_square` in `attacks`:
-              - Assume the move from `from_square` to `to_square` is legal. Then we know that 
-                no other `piece` on the ray from `to_square` to `from_square` is relevant because
-                its move to `to_square` would be illegal. Therefore, we can subtract the bitmask 
-                of that ray from `attacks` for the next step, creating a bitboard representing all
-                the other possible locations of a `piece` that could legally move to `to_square` 
-                given that a `piece` can legally move from `from_square` to `to_square`.
-              - We also know that any squares in this bitmask which fall on the same file as
-                `from_square` are not relevant for determining whether a file discriminator might be 
-                required: if another `piece` were to occupy one of those squares, then its move to
-                `to_square` would necessarily require a rank discriminator, not a file discriminator.
-                Therefore we subtract the bitmask of all squares in `from_square`'s file from the 
-                bitboard in the previous step as well.
-              - We now have a bitboard of all squares from which a `piece` can legally move to 
-                `to_square` (given that the move `piece` from `from_square` to `to_square` is legal)
-                such that, if a `piece` really were to occupy any one of those squares, it has 
-                potential to create a situation where a file discriminator is necessary. All that
-                is left to do is check whether one or more files in this bitboard have any truthy bits.
-                If so, then the `from_square` for this iteration can require a file discriminator.
-        
-        The algorithm for determining whether we need a **rank** discriminator is similar, but
-        has some differences which account for the fact that a file discriminator is preferred
-        over a rank discriminator when both can disambiguate the move:
-          - Take an empty board and place a `piece` on `to_square`, then get a bitboard `attacks`
-            of all the squares it can move to. These may all be considered possible `from_square`s.
-          - Consider each `from_square` in `attacks`:
-              - Subtract the extended ray from `to_square` towards `from_square` from `attacks`
-                by the same logic as above.
-              - This time, we know that any squares that **do not** fall on the same file as 
-                `from_square` are not relevant for determining whether a rank discriminator might be 
-                required: if another `piece` were to occupy one of those squares, then its move to
-                `to_square` would necessarily preference the file discriminator, not the rank discriminator.
-                Therefore we use a logical AND between the bitboard from the previous step and the
-                bitmask of all squares in `from_square`'s file.
-              - By the same logic as above, all that is left to do is check whether one or more ranks
-                in this bitboard have any truthy bits. If so, then the `from_square` for this 
-                iteration can require a rank discriminator.
-        
-        Determining whether we need a **full-square** discriminator is actually the simplest:
-          - Take an empty board and place a `piece` on `to_square`, then get a bitboard `attacks`
-            of all the squares it can move to. These may all be considered possible `from_square`s.
-          - Consider each `from_square` in `attacks`:
-              - Subtract the extended ray from `to_square` towards `from_square` from `attacks`
-                by the same logic as above.
-              - A full-square discriminator is required when there is another `piece` on `from_square`'s
-                same file and another one on its same rank that can both move to `to_square`. Therefore,
-                can use a logical AND between `attacks` and the bitmask of all squares in `from_square`'s
-                file, then do the same for its rank, and if both of these have truthy bits, then the
-                `from_square` for this iteration can require a full-square discriminator.
-        
-        The logic for all three of these cases can be combined into a single loop, which is what
-        happens in the code below.
-        """
-
-        piece = chess.Piece.from_symbol(symbol)
-        is_sliding_piece = piece.piece_type != chess.KNIGHT
-
-        _b.clear_board()
-        _b.set_piece_at(to_square, piece)
-        attacks = _b.attacks(to_square)
-        bb_attacks = int(attacks)
-
-        for from_square in attacks:
-            from_square_file = chess.square_file(from_square)
-            from_square_rank = chess.square_rank(from_square)
-
-            if is_sliding_piece:
-                bb_ray = _extend_ray_from_towards(to_square, from_square)
-
-            bb_from_square_file = chess.BB_FILES[from_square_file]
-            bb_from_square_rank = chess.BB_RANKS[from_square_rank]
-
-            # File Discriminator
-            bb = bb_attacks
-            if is_sliding_piece:
-                bb &= ~bb_ray
-            else:
-                bb &= ~chess.BB_SQUARES[from_square]
-            bb &= ~bb_from_square_file
+        sans.append(symbol + to_square_name)
+        sans.append(symbol + "x" + to_square_name)
 
-            if any(bb_file & bb for bb_file in chess.BB_FILES):
-                discriminator = chess.FILE_NAMES[from_square_file]
-                add_sans(discriminator, to_square)
+    """
+    To really understand the code below, we need to understand the algorithm a human uses
+    to determine whether a move from a `from_square` to a `to_square` might require a
+    file, rank, and/or full-square discriminator.
+
+    First we should consider that if moving from `from_square` to `to_square` is a legal
+    move, then even if there is another piece of the same type and color on the ray which extends 
+    from `to_square` to `from_square` and continues on to an edge of the board, moving that piece 
+    to `to_square` would be illegal. If this piece falls between `from_square` and `to_square`,
+    then the original move would not be legal, so we have a contradiction. If it is past 
+    `from_square` (on the extension of the ray between the squares that continues to the edge of 
+    the board), then it is not legal because it cannot jump over the piece at `from_square` to 
+    reach `to_square`.
+
+    This is important when considering disriminators because we are only interested in squares
+    from which another `piece` can legally move to `to_square`, and those which might create 
+    a situation where a rank, file, or full-square discriminator is necessary.
+
+    With this in mind, the algorithm for determining whether we need a **file** discriminator
+    is as follows:
+      - Take an empty board and place a `piece` on `to_square`, then get a bitboard `attacks`
+        of all the squares it can move to. These may all be considered possible `from_square`s.
+      - Consider each `from_square` in `attacks`:
+          - Assume the move from `from_square` to `to_square` is legal. Then we know that 
+            no other `piece` on the ray from `to_square` to `from_square` is relevant because
+            its move to `to_square` would be illegal. Therefore, we can subtract the bitmask 
+            of that ray from `attacks` for the next step, creating a bitboard representing all
+            the other possible locations of a `piece` that could legally move to `to_square` 
+            given that a `piece` can legally move from `from_square` to `to_square`.
+          - We also know that any squares in this bitmask which fall on the same file as
+            `from_square` are not relevant for determining whether a file discriminator might be 
+            required: if another `piece` were to occupy one of those squares, then its move to
+            `to_square` would necessarily require a rank discriminator, not a file discriminator.
+            Therefore we subtract the bitmask of all squares in `from_square`'s file from the 
+            bitboard in the previous step as well.
+          - We now have a bitboard of all squares from which a `piece` can legally move to 
+            `to_square` (given that the move `piece` from `from_square` to `to_square` is legal)
+            such that, if a `piece` really were to occupy any one of those squares, it has 
+            potential to create a situation where a file discriminator is necessary. All that
+            is left to do is check whether one or more files in this bitboard have any truthy bits.
+            If so, then the `from_square` for this iteration can require a file discriminator.
+    
+    The algorithm for determining whether we need a **rank** discriminator is similar, but
+    has some differences which account for the fact that a file discriminator is preferred
+    over a rank discriminator when both can disambiguate the move:
+      - Take an empty board and place a `piece` on `to_square`, then get a bitboard `attacks`
+        of all the squares it can move to. These may all be considered possible `from_square`s.
+      - Consider each `from_square` in `attacks`:
+          - Subtract the extended ray from `to_square` towards `from_square` from `attacks`
+            by the same logic as above.
+          - This time, we know that any squares that **do not** fall on the same file as 
+            `from_square` are not relevant for determining whether a rank discriminator might be 
+            required: if another `piece` were to occupy one of those squares, then its move to
+            `to_square` would necessarily preference the file discriminator, not the rank discriminator.
+            Therefore we use a logical AND between the bitboard from the previous step and the
+            bitmask of all squares in `from_square`'s file.
+          - By the same logic as above, all that is left to do is check whether one or more ranks
+            in this bitboard have any truthy bits. If so, then the `from_square` for this 
+            iteration can require a rank discriminator.
+    
+    Determining whether we need a **full-square** discriminator is actually the simplest:
+      - Take an empty board and place a `piece` on `to_square`, then get a bitboard `attacks`
+        of all the squares it can move to. These may all be considered possible `from_square`s.
+      - Consider each `from_square` in `attacks`:
+          - Subtract the extended ray from `to_square` towards `from_square` from `attacks`
+            by the same logic as above.
+          - A full-square discriminator is required when there is another `piece` on `from_square`'s
+            same file and another one on its same rank that can both move to `to_square`. Therefore,
+            can use a logical AND between `attacks` and the bitmask of all squares in `from_square`'s
+            file, then do the same for its rank, and if both of these have truthy bits, then the
+            `from_square` for this iteration can require a full-square discriminator.
+    
+    The logic for all three of these cases can be combined into a single loop, which is what
+    happens in the code below.
+    """
 
-            # Rank Discriminator
-            bb = bb_attacks
-            if is_sliding_piece:
-                bb &= ~bb_ray
-            else:
-                bb &= ~chess.BB_SQUARES[from_square]
-            bb &= bb_from_square_file
+    for to_square, from_square in _PIECE_MOVES[symbol]:
+        # Each SAN string is added twice, ending in one of these suffixes:
+        # once for a non-capturing move and once for a capturing move
+        to_square_name = _NAME_OF[to_square]
+        capture_to_square_name = "x" + to_square_name
 
-            if any(bb_rank & bb for bb_rank in chess.BB_RANKS):
-                discriminator = chess.RANK_NAMES[from_square_rank]
-                add_sans(discriminator, to_square)
+        # Squares from which another `piece` could also legally move to
+        # `to_square`; the three checks below each start from this bitboard
+        bb_others = (
+            attacks_by_square[to_square] & ~_EXTENDED_RAYS[to_square][from_square]
+        )
 
-            # Full-Square Discriminator
-            bb = bb_attacks
-            if is_sliding_piece:
-                bb &= ~bb_ray
-            else:
-                bb &= ~chess.BB_SQUARES[from_square]
+        bb_from_square_file = _FILE_BB_OF[from_square]
+        bb_from_square_rank = _RANK_BB_OF[from_square]
+
+        # File Discriminator
+        bb = bb_others & ~bb_from_square_file
+
+        # Any bit left over necessarily lies on some other file (or, below,
+        # on some other rank), so there is no need to check them one by one
+        if bb:
+            discriminator = _FILE_NAME_OF[from_square]
+            sans.append(symbol + discriminator + to_square_name)
+            sans.append(symbol + discriminator + capture_to_square_name)
+
+        # Rank Discriminator
+        bb = bb_others & bb_from_square_file
+
+        if bb:
+            discriminator = _RANK_NAME_OF[from_square]
+            sans.append(symbol + discriminator + to_square_name)
+            sans.append(symbol + discriminator + capture_to_square_name)
+
+        # Full-Square Discriminator
+        bb = bb_others
 
-            if (bb & bb_from_square_file) and (bb & bb_from_square_rank):
-                discriminator = chess.SQUARE_NAMES[from_square]
-                add_sans(discriminator, to_square)
+        if (bb & bb_from_square_file) and (bb & bb_from_square_rank):
+            discriminator = _NAME_OF[from_square]
+            sans.append(symbol + discriminator + to_square_name)
+            sans.append(symbol + discriminator + capture_to_square_name)
 
-    return sans
+    return set(sans)
 
 
 def get_king_sans() -> Set[str]:
     """
     Get all possible SAN strings for king moves.
     """
-    sans = set()
+    sans = []
 
     for to_square in chess.SQUARES:
         # Add the capturing and non-capturing SANs
-        to_square_name = chess.square_name(to_square)
-        sans.add(f"K{to_square_name}")
-        sans.add(f"Kx{to_square_name}")
+        to_square_name = _NAME_OF[to_square]
+        sans.append(f"K{to_square_name}")
+        sans.append(f"Kx{to_square_name}")
 
     # Add castling moves
-    sans.add("O-O")
-    sans.add("O-O-O")
+    sans.extend(("O-O", "O-O-O"))
 
-    return sans
+    return set(sans)
 
 
 def main():
@@ -294,6 +357,9 @@ def main():
         return (len(s), s)
 
     all_sans = sorted(all_sans, key=sort_key)
+    # Appending the same symbol to every SAN preserves their relative order, so
+    # this list is three already-sorted runs, which `sorted` detects and merges
+    # in linear time rather than re-sorting from scratch
     all_sans_with_symbols = sorted(
         [san + symbol for symbol in ("", "+", "#") for san in all_sans], key=sort_key
     )